@@ -7,9 +7,21 @@ import webbrowser
 import tempfile
 import json
 import html
+import base64
+import io
+import itertools
+import re
 import types
+import time
+import concurrent.futures
 import msvcrt
 
+# Optional: orjson serializes the (string-heavy) payloads several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- CONFIGURATION ---
 # Target HTML size per variable.
 # This allows significantly more data to be displayed while preventing 
@@ -19,28 +31,91 @@ TARGET_BYTES_PER_VAR = 15 * 1024 * 1024  # 15 MB per variable
 # Absolute hard ceiling for rows.
 ABSOLUTE_ROW_LIMIT = 200000
 
+# Rows always shown, whatever the byte estimate says.
+MIN_ROW_LIMIT = 50
+
+# Tables with more rows than this are drawn on demand in the browser: only
+# the rows scrolled into view exist in the DOM.
+VIRTUAL_ROW_THRESHOLD = 500
+
+# Most items a single tree level will visit: the budget over the smallest
+# item the tree can emit (~80 bytes for a short scalar), so the byte limit
+# rather than this cap ends a level.
+MAX_TREE_ITEMS = max(256, TARGET_BYTES_PER_VAR // 80)
+
+# Arrays bigger than this get a sampled (approximate) min/max in the sidebar.
+PREVIEW_SAMPLE_THRESHOLD = 200000
+PREVIEW_SAMPLE_SIZE = 100000
+
+# Matches a closing script tag inside serialized content
+_SCRIPT_CLOSE_RE = re.compile(r'</(?=script)', re.IGNORECASE)
+
+# Largest integer a JS double holds exactly; bigger ints are sent as text.
+_JS_SAFE_INT = 2 ** 53
+
+# Content bigger than this is written to its own file next to the page and
+# only loaded by the browser when the variable is opened.
+LAZY_CONTENT_BYTES = 256 * 1024
+
+_CONTENT_DIR = "var_viper_view_files"
+
+# Heatmap colours are quantized into this many CSS classes (.hm-0 .. .hm-N).
+HEATMAP_BUCKETS = 64
+
+# Bucket byte for cells left uncoloured (NaN, or a constant column).
+_NO_HEAT = 255
+
+# Names that are never listed in the explorer (our own imports/aliases).
+_SKIP_NAMES = frozenset({'var_viper', 'pd', 'np', 'sys', 'os', 'html', 'json', 'tempfile', 'webbrowser', 'types', 'traceback'})
+
+# Scalar types whose str() never needs HTML escaping.
+_PLAIN_TEXT_TYPES = frozenset({int, float, bool, np.int32, np.int64, np.float32, np.float64, np.bool_})
+
+# isinstance() tuples, built once rather than per call.
+_DF_TYPES = (pd.DataFrame, pd.Series)
+
 # --- 1. HELPER FUNCTIONS ---
 
 def get_preview_info(val):
     try:
-        if isinstance(val, (pd.DataFrame, pd.Series)):
+        if isinstance(val, _DF_TYPES):
             return f"Shape: {val.shape}"
         elif isinstance(val, np.ndarray):
             base = f"Shape: {val.shape}"
             if val.size > 0 and np.issubdtype(val.dtype, np.number):
                 try:
-                    mn, mx = np.min(val), np.max(val)
+                    # Large arrays: a strided sample of ~100K values is plenty for
+                    # a preview. .flat slicing gathers only the sampled elements.
+                    approx = ""
+                    sample = val
+                    if val.size > PREVIEW_SAMPLE_THRESHOLD:
+                        sample = val.flat[::val.size // PREVIEW_SAMPLE_SIZE]
+                        approx = "~"
+                    mn, mx = sample.min(), sample.max()
                     if isinstance(mn, (float, np.floating)):
-                        return f"{base} | Min: {mn:.2f}, Max: {mx:.2f}"
-                    return f"{base} | Min: {mn}, Max: {mx}"
+                        return f"{base} | Min: {approx}{mn:.2f}, Max: {approx}{mx:.2f}"
+                    return f"{base} | Min: {approx}{mn}, Max: {approx}{mx}"
                 except: pass
             return base
         elif isinstance(val, list):
             base = f"Length: {len(val)}"
             if len(val) > 0:
                 try:
-                    if all(isinstance(x, (int, float)) for x in val):
-                        mn, mx = min(val), max(val)
+                    # Numeric lists go through a single NumPy pass. The scalar check
+                    # on the first item stops lists of arrays/frames being stacked.
+                    if isinstance(val[0], (int, float)):
+                        arr = np.asarray(val)
+                        if arr.dtype != object and np.issubdtype(arr.dtype, np.number):
+                            mn, mx = arr.min(), arr.max()
+                            if isinstance(mn, (float, np.floating)):
+                                return f"{base} | Min: {mn:.2f}, Max: {mx:.2f}"
+                            return f"{base} | Min: {mn}, Max: {mx}"
+                except (ValueError, TypeError): pass
+                try:
+                    # Heterogeneous lists: a preview of the head is enough
+                    head = val[:1000]
+                    if all(isinstance(x, (int, float)) for x in head):
+                        mn, mx = min(head), max(head)
                         if isinstance(mn, float):
                             return f"{base} | Min: {mn:.2f}, Max: {mx:.2f}"
                         return f"{base} | Min: {mn}, Max: {mx}"
@@ -58,72 +133,332 @@ def get_preview_info(val):
     except Exception:
         return "-"
 
+# Results computed during the current show() call, keyed by
+# (kind, id, shape, dtype). The object itself is stored alongside so its id
+# can't be recycled mid-call. Cleared at the start and end of show().
+_memo_cache = {}
+
+def _memoized(kind, obj, compute):
+    key = (kind, id(obj), getattr(obj, 'shape', None), str(getattr(obj, 'dtype', '')))
+    hit = _memo_cache.get(key)
+    if hit is not None and hit[0] is obj: return hit[1]
+    result = compute()
+    _memo_cache[key] = (obj, result)
+    return result
+
+def _clamp_row_limit(bytes_per_row):
+    if bytes_per_row <= 0: bytes_per_row = 1 # Prevent divide by zero
+    
+    estimated_limit = int(TARGET_BYTES_PER_VAR / bytes_per_row)
+    
+    # Clamp between a minimum and the absolute max
+    return max(MIN_ROW_LIMIT, min(estimated_limit, ABSOLUTE_ROW_LIMIT))
+
 def estimate_df_limit(df):
     """
     Calculates how many rows we can display based on the byte budget.
     """
     total_rows = df.shape[0]
-    if total_rows == 0: return 0
+    # Anything under the minimum is shown in full, so there's nothing to measure
+    if total_rows <= MIN_ROW_LIMIT: return total_rows
+    
+    return _memoized('limit', df, lambda: _measure_df_limit(df))
+
+def _measure_df_limit(df):
+    total_rows = df.shape[0]
     
-    # Sample first 5 rows to get average bytes per row
+    # Sample first 5 rows and measure their text instead of rendering them
     sample_size = min(5, total_rows)
-    sample_html = df.head(sample_size).to_html(border=0)
+    sample = df.iloc[:sample_size]
+    text_bytes = sum(len(str(v)) for v in sample.to_numpy().ravel())
+    text_bytes += sum(len(str(i)) for i in sample.index)
     
-    # Rough length of just the table syntax overhead
-    overhead = 100 
-    bytes_per_row = (len(sample_html) - overhead) / sample_size
+    # Roughly 30 bytes of <td></td> markup per cell, plus the index cell
+    bytes_per_row = text_bytes / sample_size + 30 * (df.shape[1] + 1)
     
-    if bytes_per_row <= 0: bytes_per_row = 1 # Prevent divide by zero
+    return _clamp_row_limit(bytes_per_row)
+
+def estimate_array_limit(arr):
+    """
+    Same as estimate_df_limit, but sized straight from the dtype so no
+    DataFrame has to be built just to measure it. Text and object arrays
+    have no fixed width, so their rows are sampled like a DataFrame's.
+    """
+    if arr.shape[0] <= MIN_ROW_LIMIT: return arr.shape[0]
     
-    estimated_limit = int(TARGET_BYTES_PER_VAR / bytes_per_row)
+    n_cols = arr.shape[1] if arr.ndim == 2 else 1
+    if arr.dtype.kind in 'biufc':
+        return _memoized('limit', arr, lambda: _clamp_row_limit(arr.dtype.itemsize * n_cols * 8))
+    return _memoized('limit', arr, lambda: _measure_array_limit(arr, n_cols))
+
+def _measure_array_limit(arr, n_cols):
+    # Same sampling as _measure_df_limit; the itemsize of an object array is
+    # only the pointer size
+    sample = arr[:5]
+    text_bytes = sum(len(str(v)) for v in sample.ravel())
+    bytes_per_row = text_bytes / sample.shape[0] + 30 * (n_cols + 1)
+    return _clamp_row_limit(bytes_per_row)
+
+def _json_default(obj):
+    # Stdlib fallback for the NumPy values orjson serializes natively
+    if isinstance(obj, (np.ndarray, np.generic)): return obj.tolist()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def json_dumps(obj):
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError: # orjson.JSONEncodeError, e.g. lone surrogates
+            pass
+    # ASCII output: a lone surrogate can't be encoded when the page is written as UTF-8
+    return json.dumps(obj, ensure_ascii=True, separators=(',', ':'), default=_json_default)
+
+def write_json_object(out, mapping):
+    """
+    Streams a dict of strings to `out` as a JSON object, one entry at a time,
+    so the serialized payload is never held in memory as a single string.
+    """
+    out.write('{')
+    for i, (key, val) in enumerate(mapping.items()):
+        if i: out.write(',')
+        out.write(json_dumps(key))
+        out.write(':')
+        # Escape closing tags so embedded HTML can't terminate the <script> block
+        out.write(_SCRIPT_CLOSE_RE.sub(r'<\\/', json_dumps(val)))
+    out.write('}')
+
+def _format_numeric_column(values):
+    # astype(str) gives the shortest round-trip repr, so copied and plotted
+    # values keep their full precision
+    cells = values.astype(str).tolist()
+    if values.dtype.kind in 'iu': return cells
+    # Match pandas' spelling so the heatmap JS recognises missing values
+    return ['NaN' if c == 'nan' else c for c in cells]
+
+def _format_text_column(series):
+    # element-wise: astype(str) leaves missing values as floats in object columns
+    cells = [str(v) for v in series.to_numpy(dtype=object)]
+    return ['NaN' if c == 'nan' else c for c in cells]
+
+def _is_plain_numeric(dtype):
+    # Plain NumPy dtypes only; nullable extension dtypes carry pd.NA
+    return isinstance(dtype, np.dtype) and dtype.kind in 'iuf'
+
+def _has_simple_axes(df):
+    if df.columns.nlevels > 1 or df.index.nlevels > 1: return False
+    return df.columns.name is None and df.index.name is None
+
+def _heat_buckets(values):
+    """
+    Heatmap bucket (0 .. HEATMAP_BUCKETS - 1) of each value, scaled to the
+    column's own finite range; _NO_HEAT where there is nothing to colour.
+    """
+    values = values.astype(np.float64)
+    out = np.full(values.shape, _NO_HEAT, dtype=np.uint8)
+    finite = np.isfinite(values)
+    if not finite.any(): return out
+    lo, hi = values[finite].min(), values[finite].max()
+    if lo == hi: return out
+    out[finite] = np.rint((values[finite] - lo) / (hi - lo) * (HEATMAP_BUCKETS - 1)).astype(np.uint8)
+    return out
+
+def _numeric_attrs(numeric_cols, numeric_values):
+    """
+    Table attributes listing the numeric columns (1 = first data column), so
+    the page never has to detect them from the text. When there is something
+    to colour, also each cell's heatmap bucket as base64 bytes, column after
+    column, so the page does no float math at all.
+    """
+    if not numeric_values: return ''
+    attrs = f' data-numeric-cols="{json_dumps(numeric_cols)}"'
+    buckets = np.concatenate([_heat_buckets(v) for v in numeric_values])
+    if (buckets == _NO_HEAT).all(): return attrs
+    return attrs + f' data-heatmap-buckets="{base64.b64encode(buckets.tobytes()).decode("ascii")}"'
+
+def _frame_numeric_attrs(df):
+    heat_cols, heat_values = [], []
+    for j in range(df.shape[1]):
+        col = df.iloc[:, j]
+        if _is_plain_numeric(col.dtype):
+            heat_cols.append(j + 1)
+            heat_values.append(col.to_numpy())
+    return _numeric_attrs(heat_cols, heat_values)
+
+def _is_json_native(values):
+    """
+    True for integer arrays the page can show straight from their JSON numbers,
+    i.e. every value is exact in a JS double.
+    """
+    if values.dtype.kind not in 'iu': return False
+    return values.size == 0 or (int(values.min()) >= -_JS_SAFE_INT and int(values.max()) <= _JS_SAFE_INT)
+
+def _json_column(values):
+    # Native integer arrays are serialized by orjson in C, skipping str().
+    # Floats stay text: JS would show 1.0 as "1" and NaN would become null.
+    if _is_json_native(values): return np.ascontiguousarray(values)
+    return _format_numeric_column(values)
+
+def _frame_columns(df, rows, escape):
+    """
+    Cell values for each column of df.iloc[rows], plus the heatmap attributes
+    for its plain numeric columns. Cells are HTML-escaped text when `escape`,
+    otherwise JSON-ready values for a virtual table.
+    """
+    columns, heat_cols, heat_values = [], [], []
+    for j in range(df.shape[1]):
+        col = df.iloc[rows, j]
+        if _is_plain_numeric(col.dtype):
+            values = col.to_numpy()
+            columns.append(_format_numeric_column(values) if escape else _json_column(values))
+            heat_cols.append(j + 1) # +1: cell 0 is the index
+            heat_values.append(values)
+        else:
+            cells = _format_text_column(col)
+            columns.append([html.escape(c) for c in cells] if escape else cells)
+    return columns, _numeric_attrs(heat_cols, heat_values)
+
+def _fast_frame_to_html(df, classes, max_rows):
+    """
+    Builds the same table markup as df.to_html() with one join per row,
+    skipping pandas' formatter. Returns None when the frame needs pandas.
+    """
+    if not _has_simple_axes(df): return None
     
-    # Clamp between a minimum (50) and the absolute max
-    return max(50, min(estimated_limit, ABSOLUTE_ROW_LIMIT))
+    # Slicing the columns avoids building a head() frame
+    rows = slice(0, max_rows)
+    index = [html.escape(str(i)) for i in df.index[rows]]
+    columns, attrs = _frame_columns(df, rows, escape=True)
+    return _build_table_html(classes, df.columns, index, columns, attrs)
+
+def _build_table_html(classes, labels, index, columns, attrs=''):
+    # Same layout as df.to_html(): the index is the first <th> of every row
+    header = ''.join(f'<th>{html.escape(str(c))}</th>' for c in labels)
+    parts = [f'<table class="dataframe {classes}"{attrs}><thead><tr style="text-align: right;"><th></th>{header}</tr></thead><tbody>']
+    for idx, row in zip(index, zip(*columns)):
+        parts.append(f'<tr><th>{idx}</th><td>' + '</td><td>'.join(row) + '</td></tr>')
+    parts.append('</tbody></table>')
+    return '\n'.join(parts)
+
+def _build_virtual_table_html(classes, labels, index, columns, attrs=''):
+    """
+    Emits only the table header plus the cells as a column-major JSON payload
+    (index first); the page's virtualizeTable() renders the rows in view. Cell
+    text is raw (not escaped) because the browser writes it with textContent.
+    """
+    header = ''.join(f'<th>{html.escape(str(c))}</th>' for c in labels)
+    rows = _SCRIPT_CLOSE_RE.sub(r'<\\/', json_dumps([index, *columns]))
+    return (f'<div class="vv-viewport"><table class="dataframe {classes}"{attrs}>'
+            f'<thead><tr style="text-align: right;"><th></th>{header}</tr></thead><tbody></tbody></table>'
+            f'<script type="application/json" class="vv-rows">{rows}</script></div>')
+
+def _virtual_frame_html(df, classes, max_rows):
+    rows = slice(0, max_rows)
+    index = df.index[rows]
+    index = np.ascontiguousarray(index.to_numpy()) if _is_json_native(index.to_numpy()) else [str(i) for i in index]
+    columns, attrs = _frame_columns(df, rows, escape=False)
+    return _build_virtual_table_html(classes, df.columns, index, columns, attrs)
+
+def _vector_to_html(arr, classes='styled-table heatmap-table'):
+    """
+    Renders a 1-D array as a single 'Value' column without building a DataFrame.
+    """
+    numeric = arr.dtype.kind in 'iuf'
+    attrs = _numeric_attrs([1], [arr]) if numeric else ''
+    if arr.shape[0] > VIRTUAL_ROW_THRESHOLD:
+        cells = _json_column(arr) if numeric else [str(v) for v in arr]
+        return _build_virtual_table_html(classes, ['Value'], np.arange(arr.shape[0]), [cells], attrs)
+    cells = _format_numeric_column(arr) if numeric else [str(v) for v in arr]
+    index = np.arange(arr.shape[0]).astype(str).tolist()
+    if not numeric:
+        cells = [html.escape(c) for c in cells]
+    return _build_table_html(classes, ['Value'], index, [cells], attrs)
+
+def frame_to_html(df, max_rows=None, classes='styled-table heatmap-table'):
+    """
+    Renders the first `max_rows` rows of `df` (all rows if None) as a table.
+    """
+    n_rows = df.shape[0] if max_rows is None else min(df.shape[0], max_rows)
+    if n_rows > VIRTUAL_ROW_THRESHOLD and df.shape[1] > 0 and _has_simple_axes(df):
+        return _virtual_frame_html(df, classes, max_rows)
+    
+    fast = _fast_frame_to_html(df, classes, max_rows) if df.shape[1] > 0 else None
+    if fast is not None: return fast
+    # Not to_html(max_rows=...): that keeps the head *and* tail of the frame
+    if max_rows is not None: df = df.head(max_rows)
+    return df.to_html(classes=classes, border=0).replace('<table', '<table' + _frame_numeric_attrs(df), 1)
 
 # --- 2. CORE LOGIC ---
 
 def format_array(arr):
+    # The same array can be reached several times in one tree
+    return _memoized('array', arr, lambda: _format_array(arr))
+
+def _format_array(arr):
     if arr.ndim <= 2:
         truncated = False
         display_arr = arr
         
-        # Create a temporary DF just to calculate limits using the shared logic
-        if arr.ndim == 1: 
-            temp_df = pd.DataFrame(arr[:10], columns=['Value'])
-        else: 
-            temp_df = pd.DataFrame(arr[:10])
-            
-        limit = estimate_df_limit(temp_df)
+        limit = estimate_array_limit(arr)
         
         if arr.shape[0] > limit:
             display_arr = arr[:limit]
             truncated = True
 
         if display_arr.ndim == 1: 
-            df = pd.DataFrame(display_arr, columns=['Value'])
+            html_out = _vector_to_html(display_arr)
         else: 
-            df = pd.DataFrame(display_arr)
-            
-        html_out = df.to_html(classes='styled-table heatmap-table', border=0)
+            html_out = frame_to_html(pd.DataFrame(display_arr))
         
         if truncated:
             html_out += f"<div style='padding:5px; color:#75715e; font-style:italic'>(Showing first {limit} rows of {arr.shape[0]} - Limited by display size)</div>"
         return html_out
     else:
-        max_slices = 50
-        sliced_dict = {}
-        for i in range(min(arr.shape[0], max_slices)):
-            label = f"Slice {i}"
-            sub_val = arr[i]
-            sliced_dict[label] = sub_val 
+        parts = []
+        _render_nd_array(arr, parts)
+        return ''.join(parts)
+
+def _render_nd_array(arr, parts):
+    # >2D arrays are shown as a tree of their first-axis slices, rendered
+    # straight into `parts` rather than via an intermediate dict.
+    max_slices = 50
+    n_slices = min(arr.shape[0], max_slices)
+    current_html_len = 0
+    
+    parts.append('<ul class="tree">')
+    for i in range(n_slices):
+        if current_html_len > TARGET_BYTES_PER_VAR:
+            parts.append(f'<li style="color: #75715e; font-style: italic; margin-top:5px;">... and {arr.shape[0] - i} more slices (truncated for performance) ...</li>')
+            break
+        
+        sub_val = arr[i]
+        body = format_array(sub_val)
+        if sub_val.ndim <= 2:
+            body = f'<div class="table-wrapper">{body}</div>'
+        item_html = f'<li><details><summary><span class="key">Slice {i}</span> <span class="meta type-tag">Array {sub_val.shape}</span></summary>{body}</details></li>'
+        current_html_len += len(item_html)
+        parts.append(item_html)
+    else:
         if arr.shape[0] > max_slices:
-            sliced_dict["..."] = f"And {arr.shape[0] - max_slices} more slices..."
-        return sliced_dict
+            parts.append(f'<li><div class="row-item"><span class="key">...: </span><span class="val">And {arr.shape[0] - max_slices} more slices...</span></div></li>')
+    parts.append('</ul>')
+
+def _tree_frame_html(df):
+    limit = estimate_df_limit(df)
+    
+    if df.shape[0] > limit:
+        table_html = frame_to_html(df, max_rows=limit)
+        table_html += f"<div style='padding:5px; color:#75715e'>(Showing first {limit} rows of {df.shape[0]})</div>"
+        return table_html
+    return frame_to_html(df)
 
 def render_recursive_html(data, level=0):
-    html_str = '<ul class="tree">'
+    # Fragments are collected in a list and joined once at the end; repeated
+    # string += is quadratic in the output size for large trees.
+    parts = ['<ul class="tree">']
     
+    # Never walk further than the byte budget could plausibly reach
     iterator = data.items() if isinstance(data, dict) else enumerate(data)
+    iterator = itertools.islice(iterator, MAX_TREE_ITEMS)
     count = 0
     current_html_len = 0
     total_len = len(data)
@@ -132,117 +467,135 @@ def render_recursive_html(data, level=0):
         # DYNAMIC LIMIT: Check if we have exceeded the byte budget for this list
         if current_html_len > TARGET_BYTES_PER_VAR:
             remaining = total_len - count
-            html_str += f'<li style="color: #75715e; font-style: italic; margin-top:5px;">... and {remaining} more items (truncated for performance) ...</li>'
+            parts.append(f'<li style="color: #75715e; font-style: italic; margin-top:5px;">... and {remaining} more items (truncated for performance) ...</li>')
             break
         
         count += 1
-        item_html = '<li>'
+        item_parts = ['<li>']
+        item_html = None
         
-        if isinstance(val, (pd.DataFrame, pd.Series)):
-            df = val if isinstance(val, pd.DataFrame) else val.to_frame()
+        # Branches are ordered by how common they are in nested data, with
+        # exact type checks first (no MRO walk for the non-subclassed case)
+        t = type(val)
+        if t in _PLAIN_TEXT_TYPES:
+            # Numbers are the bulk of most trees and can't contain markup
+            item_html = f'<li><div class="row-item"><span class="key">{key}: </span><span class="val">{str(val)}</span></div></li>'
             
-            limit = estimate_df_limit(df)
+        elif t is dict or t is list or isinstance(val, (dict, list)):
+            item_count = len(val)
+            open_attr = "open" if level < 1 else ""
+            item_parts.append(f'<details {open_attr}><summary><span class="key">{key}</span> <span class="meta">[{item_count} items]</span></summary>')
+            item_parts.append(render_recursive_html(val, level + 1))
+            item_parts.append('</details>')
             
-            if df.shape[0] > limit:
-                table_html = df.head(limit).to_html(classes='styled-table heatmap-table', border=0)
-                table_html += f"<div style='padding:5px; color:#75715e'>(Showing first {limit} rows of {df.shape[0]})</div>"
-            else:
-                table_html = df.to_html(classes='styled-table heatmap-table', border=0)
+        elif (t is str or isinstance(val, str)) and val.strip().startswith('<table'):
+             item_parts.append(f'<details><summary><span class="key">{key}</span> <span class="meta">[Table Slice]</span></summary>')
+             item_parts.append(f'<div class="table-wrapper">{val}</div>')
+             item_parts.append('</details>')
+             
+        elif isinstance(val, _DF_TYPES):
+            df = val if isinstance(val, pd.DataFrame) else val.to_frame()
+            table_html = _memoized('tree-frame', val, lambda: _tree_frame_html(df))
                 
             shape = f"({df.shape[0]}x{df.shape[1]})"
-            item_html += f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">DataFrame {shape}</span></summary>'
-            item_html += f'<div class="table-wrapper">{table_html}</div>'
-            item_html += '</details>'
+            item_parts.append(f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">DataFrame {shape}</span></summary>')
+            item_parts.append(f'<div class="table-wrapper">{table_html}</div>')
+            item_parts.append('</details>')
             
         elif isinstance(val, np.ndarray):
             formatted = format_array(val)
-            if isinstance(formatted, dict):
+            if val.ndim > 2:
                 shape = str(val.shape)
-                item_html += f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">Array {shape}</span></summary>'
-                item_html += render_recursive_html(formatted, level + 1)
-                item_html += '</details>'
+                item_parts.append(f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">Array {shape}</span></summary>')
+                item_parts.append(formatted)
+                item_parts.append('</details>')
             else:
                 shape = str(val.shape)
-                item_html += f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">Array {shape}</span></summary>'
-                item_html += f'<div class="table-wrapper">{formatted}</div>'
-                item_html += '</details>'
+                item_parts.append(f'<details><summary><span class="key">{key}</span> <span class="meta type-tag">Array {shape}</span></summary>')
+                item_parts.append(f'<div class="table-wrapper">{formatted}</div>')
+                item_parts.append('</details>')
                 
-        elif isinstance(val, (dict, list)):
-            item_count = len(val)
-            open_attr = "open" if level < 1 else ""
-            item_html += f'<details {open_attr}><summary><span class="key">{key}</span> <span class="meta">[{item_count} items]</span></summary>'
-            item_html += render_recursive_html(val, level + 1)
-            item_html += '</details>'
-            
-        elif isinstance(val, str) and val.strip().startswith('<table'):
-             item_html += f'<details><summary><span class="key">{key}</span> <span class="meta">[Table Slice]</span></summary>'
-             item_html += f'<div class="table-wrapper">{val}</div>'
-             item_html += '</details>'
         else:
             safe_val = html.escape(str(val))
-            item_html += f'<div class="row-item"><span class="key">{key}: </span><span class="val">{safe_val}</span></div>'
+            item_html = f'<li><div class="row-item"><span class="key">{key}: </span><span class="val">{safe_val}</span></div></li>'
         
-        item_html += '</li>'
+        if item_html is None:
+            item_parts.append('</li>')
+            item_html = ''.join(item_parts)
         
         # Accumulate size to check against budget
         current_html_len += len(item_html)
-        html_str += item_html
+        parts.append(item_html)
+    else:
+        if total_len > count:
+            parts.append(f'<li style="color: #75715e; font-style: italic; margin-top:5px;">... and {total_len - count} more items (truncated for performance) ...</li>')
     
-    html_str += '</ul>'
-    return html_str
+    parts.append('</ul>')
+    return ''.join(parts)
 
-def show(local_vars):
-    data_store = {}
-    summary_list = []
-    
-    for name, val in local_vars.items():
-        if name.startswith('_'): continue
-        if hasattr(val, '__call__'): continue
-        if isinstance(val, types.ModuleType): continue 
-        if name in ['var_viper', 'pd', 'np', 'sys', 'os', 'html', 'json', 'tempfile', 'webbrowser', 'types', 'traceback']: continue 
-        
-        type_name = type(val).__name__
-        size_info = get_preview_info(val)
-        content_html = ""
+def render_variable(name, val):
+    buf = io.StringIO()
 
-        try:
-            if isinstance(val, (pd.DataFrame, pd.Series)):
-                df = val if isinstance(val, pd.DataFrame) else val.to_frame()
-                
-                limit = estimate_df_limit(df)
+    try:
+        t = type(val)
+        if t is dict or t is list or isinstance(val, (dict, list)):
+            buf.write("<div class='tree-wrapper'>")
+            buf.write(render_recursive_html(val))
+            buf.write("</div>")
+        elif isinstance(val, _DF_TYPES):
+            df = val if isinstance(val, pd.DataFrame) else val.to_frame()
+            
+            limit = estimate_df_limit(df)
+            
+            if df.shape[0] > limit:
+                buf.write(frame_to_html(df, max_rows=limit))
+                buf.write(f"<div style='padding:10px; color:#75715e; font-style:italic'>(Showing first {limit} rows of {df.shape[0]} - Limited by display size)</div>")
+            else:
+                buf.write(frame_to_html(df))
                 
-                if df.shape[0] > limit:
-                    html_table = df.head(limit).to_html(classes='styled-table heatmap-table', border=0)
-                    html_table += f"<div style='padding:10px; color:#75715e; font-style:italic'>(Showing first {limit} rows of {df.shape[0]} - Limited by display size)</div>"
-                    content_html = html_table
-                else:
-                    content_html = df.to_html(classes='styled-table heatmap-table', border=0)
-                    
-            elif isinstance(val, np.ndarray):
-                formatted_data = format_array(val)
-                if isinstance(formatted_data, dict):
-                    content_html = f"<div class='tree-wrapper'>{render_recursive_html(formatted_data)}</div>"
-                else:
-                    content_html = formatted_data
-            elif isinstance(val, (dict, list)):
-                content_html = f"<div class='tree-wrapper'>{render_recursive_html(val)}</div>"
+        elif isinstance(val, np.ndarray):
+            formatted_data = format_array(val)
+            if val.ndim > 2:
+                buf.write("<div class='tree-wrapper'>")
+                buf.write(formatted_data)
+                buf.write("</div>")
             else:
-                content_html = f"<div class='text-box'>{html.escape(str(val))}</div>"
-        except Exception as e:
-            content_html = f"<div class='error-box'>Error processing variable '{name}': {e}</div>"
+                buf.write(formatted_data)
+        else:
+            buf.write(f"<div class='text-box'>{html.escape(str(val))}</div>")
+        return buf.getvalue()
+    except Exception as e:
+        return f"<div class='error-box'>Error processing variable '{name}': {e}</div>"
+
+def _render_one(name, val):
+    return name, type(val).__name__, get_preview_info(val), render_variable(name, val)
 
+def show(local_vars):
+    data_store = {}
+    summary_list = []
+    _memo_cache.clear()
+    
+    items = [
+        (name, val) for name, val in local_vars.items()
+        if not name.startswith('_') and name not in _SKIP_NAMES
+        and not callable(val) and not isinstance(val, types.ModuleType)
+    ]
+    
+    # Variables render independently, so they are spread over a thread pool.
+    # pool.map keeps the results in input order for the sidebar.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = list(pool.map(lambda item: _render_one(*item), items))
+    
+    for name, type_name, size_info, content_html in results:
         summary_list.append({"id": name, "type": type_name, "size": size_info})
         data_store[name] = content_html
 
+    _memo_cache.clear()
     generate_html(summary_list, data_store)
 
-def generate_html(summary_list, data_store):
-    filename = "var_viper_view.html"
-    filepath = os.path.join(tempfile.gettempdir(), filename)
-    json_vars = json.dumps(summary_list)
-    json_content = json.dumps(data_store)
-
-    html_template = f"""
+# The page template. Payloads are streamed to disk in place of the
+# __VV_VARS__ / __VV_CONTENT__ sentinels (see generate_html).
+_TEMPLATE = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -251,7 +604,7 @@ def generate_html(summary_list, data_store):
         <title>Var Viper</title>
         <style id="viper-styles">
             /* --- MONOKAI THEME --- */
-            :root {{ 
+            :root { 
                 --bg: #272822; 
                 --sidebar-bg: #1e1f1c;
                 --fg: #f8f8f2; 
@@ -263,15 +616,15 @@ def generate_html(summary_list, data_store):
                 --selection: #49483e;
                 --table-head: #66d9ef; 
                 --table-head-text: #272822;
-            }}
-            * {{ box-sizing: border-box; }}
-            body {{ font-family: 'Consolas', 'Monaco', 'Courier New', monospace; margin: 0; height: 100vh; overflow: hidden; display: flex; background: var(--bg); color: var(--fg); }}
+            }
+            * { box-sizing: border-box; }
+            body { font-family: 'Consolas', 'Monaco', 'Courier New', monospace; margin: 0; height: 100vh; overflow: hidden; display: flex; background: var(--bg); color: var(--fg); }
             
             /* --- LAYOUT --- */
-            #sidebar {{ width: 300px; min-width: 150px; max-width: 50%; background: var(--sidebar-bg); display: flex; flex-direction: column; }}
+            #sidebar { width: 300px; min-width: 150px; max-width: 50%; background: var(--sidebar-bg); display: flex; flex-direction: column; }
             
             /* SIDEBAR RESIZER */
-            #sidebar-resizer {{
+            #sidebar-resizer {
                 width: 6px;
                 background-color: var(--bg);
                 border-left: 1px solid var(--border);
@@ -280,12 +633,12 @@ def generate_html(summary_list, data_store):
                 user-select: none;
                 transition: background-color 0.2s;
                 z-index: 10;
-            }}
-            #sidebar-resizer:hover, #sidebar-resizer.resizing {{ background-color: var(--accent-pink); }}
+            }
+            #sidebar-resizer:hover, #sidebar-resizer.resizing { background-color: var(--accent-pink); }
 
-            #content {{ flex: 1; overflow: hidden; display: flex; flex-direction: column; background: var(--bg); }}
+            #content { flex: 1; overflow: hidden; display: flex; flex-direction: column; background: var(--bg); }
             
-            .sidebar-header {{ 
+            .sidebar-header { 
                 padding: 15px; 
                 background: #171814; 
                 font-weight: bold; 
@@ -297,8 +650,8 @@ def generate_html(summary_list, data_store):
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
-            }}
-            #sort-select {{
+            }
+            #sort-select {
                 background: #3e3d32;
                 color: #f8f8f2;
                 border: 1px solid #49483e;
@@ -308,66 +661,73 @@ def generate_html(summary_list, data_store):
                 outline: none;
                 cursor: pointer;
                 margin-left: 10px;
-            }}
-            #var-list {{ overflow-y: auto; flex: 1; }}
-            #viewer-header {{ padding: 15px; border-bottom: 1px solid var(--border); background: var(--sidebar-bg); font-size: 1.2em; font-weight: bold; height: 60px; display: flex; align-items: center; color: var(--accent-blue); }}
-            #viewer-body {{ flex: 1; overflow: auto; padding: 20px; position: relative; }}
+            }
+            #var-list { overflow-y: auto; flex: 1; }
+            #viewer-header { padding: 15px; border-bottom: 1px solid var(--border); background: var(--sidebar-bg); font-size: 1.2em; font-weight: bold; height: 60px; display: flex; align-items: center; color: var(--accent-blue); }
+            #viewer-body { flex: 1; overflow: auto; padding: 20px; position: relative; }
 
             /* --- SIDEBAR ITEMS --- */
             /* REDUCED PADDING AND FONT SIZE FOR COMPACT VIEW */
-            .var-item {{ padding: 6px 10px; border-bottom: 1px solid var(--border); cursor: pointer; transition: background 0.1s; overflow: hidden; }}
-            .var-item:hover {{ background: #3e3d32; }}
-            .var-item.active {{ background: var(--selection); border-left: 4px solid var(--accent-pink); padding-left: 6px; }}
-            .var-item .header-row {{ display: flex; justify-content: space-between; align-items: center; }}
-            .var-item .type-tag {{ font-size: 0.7em; background: var(--border); padding: 2px 6px; border-radius: 4px; color: var(--accent-blue); flex-shrink: 0; margin-left: 5px; }}
-            .var-item.active .type-tag {{ background: var(--accent-pink); color: white; }}
-            .var-item strong {{ color: var(--fg); font-size: 0.9em; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
-            .var-item .meta {{ font-size: 0.75em; color: #75715e; margin-top: 2px; display: block; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
+            .var-item { padding: 6px 10px; border-bottom: 1px solid var(--border); cursor: pointer; transition: background 0.1s; overflow: hidden; }
+            .var-item:hover { background: #3e3d32; }
+            .var-item.active { background: var(--selection); border-left: 4px solid var(--accent-pink); padding-left: 6px; }
+            .var-item .header-row { display: flex; justify-content: space-between; align-items: center; }
+            .var-item .type-tag { font-size: 0.7em; background: var(--border); padding: 2px 6px; border-radius: 4px; color: var(--accent-blue); flex-shrink: 0; margin-left: 5px; }
+            .var-item.active .type-tag { background: var(--accent-pink); color: white; }
+            .var-item strong { color: var(--fg); font-size: 0.9em; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+            .var-item .meta { font-size: 0.75em; color: #75715e; margin-top: 2px; display: block; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
 
             /* --- TABLES --- */
-            .table-wrapper {{ overflow: auto; max-height: 700px; border: 1px solid var(--border); margin-top: 5px; background: #272822; }}
-            .styled-table {{
+            .table-wrapper { overflow: auto; max-height: 700px; border: 1px solid var(--border); margin-top: 5px; background: #272822; }
+            /* Off-screen tables skip layout and paint; changes inside one don't reflow the page */
+            .table-wrapper { contain: layout paint style; content-visibility: auto; contain-intrinsic-size: auto 400px; }
+            .styled-table {
                 border-collapse: collapse;
                 font-size: 0.9em;
                 width: auto;
                 min-width: 100%;
                 table-layout: auto;
-            }}
-            .styled-table th {{ background-color: var(--table-head); color: var(--table-head-text); position: sticky; top: 0; z-index: 2; padding: 10px; text-align: left; border-right: 1px solid rgba(0,0,0,0.1); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; position: relative; }}
-            .styled-table td {{ padding: 8px 10px; border-bottom: 1px solid var(--border); border-right: 1px solid var(--border); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; color: var(--fg); }}
-            .styled-table td[style*="background-color"] {{ color: white; text-shadow: 0px 0px 2px black; }}
+            }
+            .styled-table th { background-color: var(--table-head); color: var(--table-head-text); position: sticky; top: 0; z-index: 2; padding: 10px; text-align: left; border-right: 1px solid rgba(0,0,0,0.1); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; position: relative; }
+            .styled-table td { padding: 8px 10px; border-bottom: 1px solid var(--border); border-right: 1px solid var(--border); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; color: var(--fg); user-select: none; }
+            .styled-table td[class*="hm-"] { color: white; text-shadow: 0px 0px 2px black; }
+__VV_HEATMAP_CSS__
+
+            /* VIRTUAL TABLES: scroll viewport and the spacer rows around the rendered window */
+            .vv-viewport { overflow: auto; max-height: 680px; contain: layout paint style; }
+            .vv-pad td { padding: 0; border: none; }
 
-            .col-resizer {{ position: absolute; right: 0; top: 0; height: 100%; width: 5px; cursor: col-resize; user-select: none; touch-action: none; opacity: 0; }}
-            .styled-table th:hover .col-resizer {{ opacity: 1; background-color: rgba(0,0,0,0.2); }}
-            .col-resizer.resizing {{ opacity: 1; background-color: var(--accent-pink); }}
+            .col-resizer { position: absolute; right: 0; top: 0; height: 100%; width: 5px; cursor: col-resize; user-select: none; touch-action: none; opacity: 0; }
+            .styled-table th:hover .col-resizer { opacity: 1; background-color: rgba(0,0,0,0.2); }
+            .col-resizer.resizing { opacity: 1; background-color: var(--accent-pink); }
 
             /* --- TREE VIEW --- */
-            .tree-wrapper {{ font-family: Consolas, monospace; font-size: 0.95em; }}
-            ul.tree {{ list-style: none; padding-left: 20px; margin: 0; }}
-            ul.tree li {{ margin: 6px 0; }}
-            details > summary {{ list-style: none; cursor: pointer; outline: none; color: var(--accent-blue); }}
-            details > summary::-webkit-details-marker {{ display: none; }}
-            details summary::before {{ content: '▶'; display: inline-block; margin-right: 6px; font-size: 0.8em; color: var(--border); transition: transform 0.1s; }}
-            details[open] > summary::before {{ transform: rotate(90deg); color: var(--accent-pink); }}
-            .key {{ color: var(--accent-pink); font-weight: bold; }}
-            .val {{ color: var(--accent-yellow); white-space: pre-wrap; word-break: break-word; }}
-            .meta {{ color: #75715e; font-size: 0.85em; font-style: italic; }}
-            .row-item {{ padding-left: 20px; }}
-
-            .text-box {{ font-size: 1.5em; padding: 30px; background: var(--sidebar-bg); border: 1px solid var(--border); border-radius: 8px; display: inline-block; white-space: pre-wrap; color: var(--accent-yellow); min-width: 200px; text-align: center; }}
-            .error-box {{ color: #ff4444; background-color: #330000; border: 1px solid red; padding: 15px; }}
-            .placeholder {{ text-align: center; color: #75715e; margin-top: 20vh; }}
+            .tree-wrapper { font-family: Consolas, monospace; font-size: 0.95em; }
+            ul.tree { list-style: none; padding-left: 20px; margin: 0; }
+            ul.tree li { margin: 6px 0; }
+            details > summary { list-style: none; cursor: pointer; outline: none; color: var(--accent-blue); }
+            details > summary::-webkit-details-marker { display: none; }
+            details summary::before { content: '▶'; display: inline-block; margin-right: 6px; font-size: 0.8em; color: var(--border); transition: transform 0.1s; }
+            details[open] > summary::before { transform: rotate(90deg); color: var(--accent-pink); }
+            .key { color: var(--accent-pink); font-weight: bold; }
+            .val { color: var(--accent-yellow); white-space: pre-wrap; word-break: break-word; }
+            .meta { color: #75715e; font-size: 0.85em; font-style: italic; }
+            .row-item { padding-left: 20px; }
+
+            .text-box { font-size: 1.5em; padding: 30px; background: var(--sidebar-bg); border: 1px solid var(--border); border-radius: 8px; display: inline-block; white-space: pre-wrap; color: var(--accent-yellow); min-width: 200px; text-align: center; }
+            .error-box { color: #ff4444; background-color: #330000; border: 1px solid red; padding: 15px; }
+            .placeholder { text-align: center; color: #75715e; margin-top: 20vh; }
             
             /* --- PLOT STYLES --- */
-            .selected-cell {{ box-shadow: inset 0 0 0 2px var(--accent-pink); background-color: rgba(249, 38, 114, 0.2) !important; }}
-            #plot-btn {{ 
+            .selected-cell { box-shadow: inset 0 0 0 2px var(--accent-pink); background-color: rgba(249, 38, 114, 0.2) !important; }
+            #plot-btn { 
                 position: fixed; bottom: 20px; right: 20px; 
                 background: var(--accent-pink); color: white; border: none; 
                 padding: 10px 20px; border-radius: 4px; cursor: pointer; 
                 font-weight: bold; display: none; z-index: 100; 
                 box-shadow: 0 4px 6px rgba(0,0,0,0.3); font-size: 14px;
-            }}
-            #plot-btn:hover {{ background: #ff4081; }}
+            }
+            #plot-btn:hover { background: #ff4081; }
         </style>
     </head>
     <body>
@@ -396,9 +756,13 @@ def generate_html(summary_list, data_store):
         <!-- PLOT UI -->
         <button id="plot-btn" onclick="plotData()">Plot Selection</button>
 
+        <script id="viper-vars" type="application/json">__VV_VARS__</script>
+        <script id="viper-data" type="application/json">__VV_CONTENT__</script>
+
         <script>
-            const variables = {json_vars};
-            const contentData = {json_content};
+            // JSON.parse of an inert data block is cheaper than evaluating a JS literal
+            const variables = JSON.parse(document.getElementById('viper-vars').textContent);
+            const contentData = JSON.parse(document.getElementById('viper-data').textContent);
 
             const listEl = document.getElementById('var-list');
             const headerEl = document.getElementById('viewer-header');
@@ -410,171 +774,266 @@ def generate_html(summary_list, data_store):
             let startCell = null;
             let activeTable = null;
 
+            // Cards start as empty, fixed-height placeholders and are filled in
+            // as they scroll into view, so long variable lists render quickly.
+            const cardObserver = 'IntersectionObserver' in window ? new IntersectionObserver(entries => {
+                for (const e of entries) {
+                    if (!e.isIntersecting) continue;
+                    cardObserver.unobserve(e.target);
+                    fillCard(e.target);
+                }
+            }, {root: listEl, rootMargin: '200px'}) : null;
+
             // Initial rendering
             renderList(variables);
 
-            sortSelect.addEventListener('change', () => {{
+            sortSelect.addEventListener('change', () => {
                 const mode = sortSelect.value;
                 let sorted = [...variables];
                 
-                if (mode === 'alpha') {{
+                if (mode === 'alpha') {
                     sorted.sort((a, b) => a.id.localeCompare(b.id));
-                }} else if (mode === 'alpha-desc') {{
+                } else if (mode === 'alpha-desc') {
                     sorted.sort((a, b) => b.id.localeCompare(a.id));
-                }} else if (mode === 'created-desc') {{
+                } else if (mode === 'created-desc') {
                     sorted.reverse();
-                }}
+                }
                 renderList(sorted);
-            }});
+            });
+
+            function fillCard(div) {
+                const v = div._v;
+                div.style.height = '';
+                div.innerHTML = `
+                    <div class="header-row"><strong>${v.id}</strong><span class="type-tag">${v.type}</span></div>
+                    <div class="meta">${v.size}</div>
+                `;
+            }
 
-            function renderList(items) {{
+            function renderList(items) {
+                if (cardObserver) cardObserver.disconnect();
                 listEl.innerHTML = '';
-                items.forEach(v => {{
+                items.forEach(v => {
                     const div = document.createElement('div');
                     div.className = 'var-item';
-                    if (headerEl.textContent === v.id) {{
+                    if (headerEl.textContent === v.id) {
                         div.classList.add('active');
-                    }}
-                    div.innerHTML = `
-                        <div class="header-row"><strong>${{v.id}}</strong><span class="type-tag">${{v.type}}</span></div>
-                        <div class="meta">${{v.size}}</div>
-                    `;
+                    }
+                    div._v = v;
                     div.onclick = () => loadVariable(v.id, div);
                     div.ondblclick = () => popOutVariable(v.id);
+                    if (cardObserver) {
+                        div.style.height = '50px';
+                        cardObserver.observe(div);
+                    } else {
+                        fillCard(div);
+                    }
                     listEl.appendChild(div);
-                }});
-            }}
+                });
+            }
 
-            function loadVariable(id, element) {{
+            function loadVariable(id, element) {
                 document.querySelectorAll('.var-item').forEach(el => el.classList.remove('active'));
                 if(element) element.classList.add('active');
                 headerEl.textContent = id;
-                bodyEl.innerHTML = contentData[id];
-                const tables = bodyEl.querySelectorAll('table');
-                tables.forEach(table => {{
-                    makeColResizable(table);
-                    if(table.classList.contains('heatmap-table')) applyHeatmap(table);
-                    makeTableSelectable(table);
-                }});
+                activeTable = null;
                 updatePlotButton();
-            }}
+                if (!(id in contentData)) bodyEl.innerHTML = `<div class="placeholder"><h2>Loading ${id}...</h2></div>`;
+                withContent(id, html => {
+                    if (headerEl.textContent !== id) return; // another variable was opened meanwhile
+                    bodyEl.innerHTML = html;
+                    bodyEl.querySelectorAll('table').forEach(initTable);
+                });
+            }
+
+            // --- LAZY CONTENT ---
+            // Big variables are written to their own script files next to the
+            // page (see generate_html) and only loaded when first opened. Each
+            // file is a single vvContent(id, html) call; fetch() is not an
+            // option because browsers block it on file:// pages.
+            const contentSrc = {};
+            variables.forEach(v => { if (v.src) contentSrc[v.id] = v.src; });
+            const contentWaiters = {};
+
+            function vvContent(id, html) {
+                contentData[id] = html;
+                const waiters = contentWaiters[id] || [];
+                delete contentWaiters[id];
+                waiters.forEach(cb => cb(html));
+            }
+
+            function withContent(id, cb) {
+                if (id in contentData) return cb(contentData[id]);
+                if (contentWaiters[id]) return contentWaiters[id].push(cb);
+                contentWaiters[id] = [cb];
+                const script = document.createElement('script');
+                script.src = contentSrc[id];
+                script.onerror = () => failContent(id, `Could not load ${id} from ${contentSrc[id]}`);
+                // A file that ran but never called vvContent(id) would leave the waiters hanging
+                script.onload = () => {
+                    if (!(id in contentData)) failContent(id, `${contentSrc[id]} did not contain ${id}`);
+                };
+                document.head.appendChild(script);
+            }
+
+            function failContent(id, message) {
+                const waiters = contentWaiters[id] || [];
+                delete contentWaiters[id];
+                waiters.forEach(cb => cb(`<div class="error-box">${message}</div>`));
+            }
+
+            function initTable(table) {
+                virtualizeTable(table);
+                makeColResizable(table);
+                if(table.classList.contains('heatmap-table')) applyHeatmap(table);
+                makeTableSelectable(table);
+            }
 
             // --- PLOTTING LOGIC ---
-            
-            function makeTableSelectable(table) {{
-                // CELL SELECTION (Existing)
-                const cells = table.querySelectorAll('td');
-                cells.forEach(cell => {{
-                    cell.style.userSelect = 'none'; 
-                    cell.addEventListener('mousedown', (e) => {{
-                        if (e.button !== 0) return;
-                        isMouseDown = true;
-                        startCell = cell;
-                        activeTable = table;
-                        document.querySelectorAll('.selected-cell').forEach(c => c.classList.remove('selected-cell'));
-                        cell.classList.add('selected-cell');
-                        updatePlotButton();
-                    }});
-                    cell.addEventListener('mouseover', () => {{
-                        if (isMouseDown && activeTable === table && startCell) {{
-                            selectRange(table, startCell, cell);
-                        }}
-                    }});
-                }});
-                
+
+            // A selection is a rectangle of body-row / cell indices stored on
+            // its table ({r0, r1, c0, c1}), so it also covers the rows of a
+            // virtual table that aren't currently in the DOM.
+            function bodyRowCount(table) {
+                return table._vv ? table._vv.data[0].length : table.tBodies[0].rows.length;
+            }
+
+            function cellText(table, r, c) {
+                if (table._vv) return table._vv.data[c][r]; // column-major
+                const cell = table.tBodies[0].rows[r].cells[c];
+                return cell ? cell.textContent.trim() : '';
+            }
+
+            function cellPos(table, cell) {
+                const tr = cell.parentElement;
+                return {r: table._vv ? +tr.dataset.r : tr.sectionRowIndex, c: cell.cellIndex};
+            }
+
+            function setSelection(table, sel) {
+                if (activeTable && activeTable !== table) {
+                    activeTable._sel = null;
+                    paintSelection(activeTable);
+                }
+                activeTable = table;
+                table._sel = sel;
+                // Drag-selecting can fire many mouseovers per frame; paint once
+                if (!table._paintId) table._paintId = requestAnimationFrame(() => {
+                    table._paintId = 0;
+                    paintSelection(table);
+                    updatePlotButton();
+                });
+            }
+
+            function paintSelection(table) {
+                const sel = table._sel;
+                const rows = table.tBodies[0].rows;
+                const inRect = (s, r, c) => !!s && r >= s.r0 && r <= s.r1 && c >= s.c0 && c <= s.c1;
+                if (table._vv) {
+                    // Virtual tables only hold the rows in view; repaint them all
+                    for (const tr of rows) {
+                        if (tr.classList.contains('vv-pad')) continue;
+                        const r = +tr.dataset.r;
+                        for (let c = 1; c < tr.cells.length; c++) tr.cells[c].classList.toggle('selected-cell', inRect(sel, r, c));
+                    }
+                    return;
+                }
+                // Otherwise only touch the cells that enter or leave the selection
+                const old = table._painted;
+                table._painted = sel;
+                const mark = (from, keep, on) => {
+                    if (!from) return;
+                    for (let r = from.r0; r <= from.r1 && r < rows.length; r++) {
+                        const cells = rows[r].cells;
+                        for (let c = from.c0; c <= from.c1 && c < cells.length; c++) {
+                            if (inRect(keep, r, c) || cells[c].tagName !== 'TD') continue;
+                            cells[c].classList.toggle('selected-cell', on);
+                        }
+                    }
+                };
+                mark(old, sel, false);
+                mark(sel, old, true);
+            }
+
+            function selectedValues() {
+                // Selected cell texts, one array per row
+                const sel = activeTable && activeTable._sel;
+                if (!sel) return [];
+                const out = [];
+                for (let r = sel.r0; r <= sel.r1; r++) {
+                    const row = [];
+                    for (let c = sel.c0; c <= sel.c1; c++) row.push(cellText(activeTable, r, c));
+                    out.push(row);
+                }
+                return out;
+            }
+
+            function makeTableSelectable(table) {
+                // CELL SELECTION
+                // Listeners sit on the table, not on each cell: virtual tables
+                // recycle their row elements while scrolling.
+                const isBodyCell = cell => cell && cell.parentElement.parentElement === table.tBodies[0] && !cell.parentElement.classList.contains('vv-pad');
+                table.addEventListener('mousedown', (e) => {
+                    if (e.button !== 0) return;
+                    const cell = e.target.closest('td');
+                    if (!isBodyCell(cell)) return;
+                    isMouseDown = true;
+                    startCell = cellPos(table, cell);
+                    selectRange(table, startCell, startCell);
+                });
+                table.addEventListener('mouseover', (e) => {
+                    if (!isMouseDown || activeTable !== table || !startCell) return;
+                    const cell = e.target.closest('td');
+                    if (isBodyCell(cell)) selectRange(table, startCell, cellPos(table, cell));
+                });
+
                 // HEADER SELECTION (Rows/Cols)
-                const headers = table.querySelectorAll('th');
-                headers.forEach(th => {{
+                table.querySelectorAll('th').forEach(th => {
                     th.style.cursor = 'pointer';
                     th.title = "Click to select row/column";
-                    
-                    th.addEventListener('click', (e) => {{
-                        // Ignore clicks on resizer
-                        if(e.target.classList.contains('col-resizer')) return;
-                        
-                        // Clear existing selection
-                        document.querySelectorAll('.selected-cell').forEach(c => c.classList.remove('selected-cell'));
-                        
-                        const row = th.parentElement;
-                        const tableSection = row.parentElement; // thead or tbody
-                        
-                        if (tableSection.tagName === 'THEAD') {{
-                            // Column Select
-                            const colIdx = th.cellIndex;
-                            const rows = table.querySelectorAll('tbody tr');
-                            rows.forEach(r => {{
-                                const cell = r.children[colIdx];
-                                if (cell && cell.tagName === 'TD') {{
-                                    cell.classList.add('selected-cell');
-                                }}
-                            }});
-                        }} else {{
-                            // Row Select (th is index)
-                            const rowCells = row.querySelectorAll('td');
-                            rowCells.forEach(c => c.classList.add('selected-cell'));
-                        }}
-                        updatePlotButton();
-                    }});
-                }});
-            }}
-
-            function selectRange(table, start, end) {{
-                const startRow = start.parentElement.rowIndex;
-                const endRow = end.parentElement.rowIndex;
-                const startCol = start.cellIndex;
-                const endCol = end.cellIndex;
-                const minRow = Math.min(startRow, endRow);
-                const maxRow = Math.max(startRow, endRow);
-                const minCol = Math.min(startCol, endCol);
-                const maxCol = Math.max(startCol, endCol);
-
-                document.querySelectorAll('.selected-cell').forEach(c => c.classList.remove('selected-cell'));
-
-                for (let r = minRow; r <= maxRow; r++) {{
-                    const row = table.rows[r];
-                    if (!row) continue;
-                    for (let c = minCol; c <= maxCol; c++) {{
-                        const cell = row.cells[c];
-                        if (cell && cell.tagName === 'TD') {{
-                            cell.classList.add('selected-cell');
-                        }}
-                    }}
-                }}
-                updatePlotButton();
-            }}
+                });
+                table.addEventListener('click', (e) => {
+                    const th = e.target.closest('th');
+                    // Ignore clicks on resizer
+                    if (!th || e.target.classList.contains('col-resizer')) return;
+
+                    if (th.parentElement.parentElement.tagName === 'THEAD') {
+                        // Column Select (the index header selects nothing)
+                        const c = th.cellIndex;
+                        setSelection(table, c < 1 ? null : {r0: 0, r1: bodyRowCount(table) - 1, c0: c, c1: c});
+                    } else {
+                        // Row Select (th is index)
+                        const r = cellPos(table, th).r;
+                        setSelection(table, {r0: r, r1: r, c0: 1, c1: th.parentElement.cells.length - 1});
+                    }
+                });
+            }
 
-            function updatePlotButton() {{
-                const count = document.querySelectorAll('.selected-cell').length;
+            function selectRange(table, start, end) {
+                setSelection(table, {
+                    r0: Math.min(start.r, end.r), r1: Math.max(start.r, end.r),
+                    c0: Math.max(1, Math.min(start.c, end.c)), c1: Math.max(start.c, end.c)
+                });
+            }
+
+            function updatePlotButton() {
+                const sel = activeTable && activeTable._sel;
+                const count = sel ? (sel.r1 - sel.r0 + 1) * (sel.c1 - sel.c0 + 1) : 0;
                 const btn = document.getElementById('plot-btn');
-                if (count > 1) {{
+                if (count > 1) {
                     btn.style.display = 'block';
-                    btn.textContent = `Plot ${{count}} points`;
-                }} else {{
+                    btn.textContent = `Plot ${count} points`;
+                } else {
                     btn.style.display = 'none';
-                }}
-            }}
+                }
+            }
             
-            function copySelection(e) {{
-                if ((e.ctrlKey || e.metaKey) && e.key === 'c') {{
-                    const selected = document.querySelectorAll('.selected-cell');
-                    if (selected.length === 0) return;
+            function copySelection(e) {
+                if ((e.ctrlKey || e.metaKey) && e.key === 'c') {
+                    const rows = selectedValues();
+                    if (rows.length === 0) return;
                     e.preventDefault();
                     
-                    // Group by Row
-                    const rows = {{}};
-                    selected.forEach(cell => {{
-                        const r = cell.parentElement.rowIndex;
-                        if(!rows[r]) rows[r] = [];
-                        rows[r].push(cell);
-                    }});
-                    
-                    // Sort and Format
-                    const rowIndices = Object.keys(rows).sort((a,b)=>a-b);
-                    const tsv = rowIndices.map(idx => {{
-                        const cells = rows[idx];
-                        cells.sort((a,b)=>a.cellIndex - b.cellIndex);
-                        return cells.map(c=>c.textContent.trim()).join('\\t');
-                    }}).join('\\n');
+                    const tsv = rows.map(row => row.join('\\t')).join('\\n');
                     
                     const ta = document.createElement('textarea');
                     ta.value = tsv;
@@ -585,246 +1044,420 @@ def generate_html(summary_list, data_store):
                     
                     // Feedback
                     const btn = document.getElementById('plot-btn');
-                    if(btn && btn.style.display !== 'none') {{
+                    if(btn && btn.style.display !== 'none') {
                         const orig = btn.textContent;
                         btn.textContent = "Copied!";
                         setTimeout(()=>btn.textContent = orig, 1000);
-                    }}
-                }}
-            }}
+                    }
+                }
+            }
             
             document.addEventListener('keydown', copySelection);
 
-            function plotData() {{
-                const cells = document.querySelectorAll('.selected-cell');
+            function plotData() {
                 let data = [];
-                cells.forEach(c => {{
-                    const txt = c.textContent.trim();
-                    if(txt && txt !== 'NaN' && txt !== 'None') {{
+                // Columns Python marked numeric need no text checks
+                const sel = activeTable && activeTable._sel;
+                const numeric = new Set(sel ? JSON.parse(activeTable.dataset.numericCols || '[]') : []);
+                selectedValues().forEach(row => row.forEach((txt, k) => {
+                    if (numeric.has(sel.c0 + k)) {
+                        const val = +txt;
+                        if (isFinite(val)) data.push(val);
+                    } else if(txt && txt !== 'NaN' && txt !== 'None') {
                         const val = parseFloat(txt);
                         if (!isNaN(val)) data.push(val);
-                    }}
-                }});
+                    }
+                }));
                 
                 if (data.length < 2) return alert("Select at least 2 numeric values to plot.");
 
                 const win = window.open("", "_blank", "width=800,height=600");
-                win.document.write(`
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <title>Data Plot</title>
-                        <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"><\\/script>
-                        <style>
-                            body {{ background: #272822; color: #f8f8f2; margin: 0; padding: 0; overflow: hidden; font-family: sans-serif; }}
-                            #chart {{ width: 100vw; height: 100vh; }}
-                        </style>
-                    </head>
-                    <body>
-                        <div id="chart"></div>
-                        <script>
-                            const data = ${{JSON.stringify(data)}};
-                            const trace = {{
-                                y: data,
-                                mode: 'lines',
-                                type: 'scatter',
-                                line: {{ width: 1, color: '#66d9ef' }}
-                            }};
-                            const layout = {{
-                                paper_bgcolor: '#272822',
-                                plot_bgcolor: '#272822',
-                                font: {{ color: '#f8f8f2' }},
-                                margin: {{ t: 50, r: 20, l: 50, b: 50 }},
-                                xaxis: {{ gridcolor: '#49483e', zerolinecolor: '#49483e' }},
-                                yaxis: {{ gridcolor: '#49483e', zerolinecolor: '#49483e' }},
-                                title: 'Selected Data Plot'
-                            }};
-                            Plotly.newPlot('chart', [trace], layout, {{responsive: true}});
-                        <\\/script>
-                    </body>
-                    </html>
-                `);
-                win.document.close();
-            }}
+                if (!win) return alert("Pop-up blocked!");
+
+                // Build the plot window in place rather than through document.write()
+                const doc = win.document;
+                doc.title = 'Data Plot';
+                const style = doc.createElement('style');
+                style.textContent = `
+                    body { background: #272822; color: #f8f8f2; margin: 0; padding: 0; overflow: hidden; font-family: sans-serif; }
+                    #chart { width: 100vw; height: 100vh; }`;
+                doc.head.appendChild(style);
+                const chart = doc.createElement('div');
+                chart.id = 'chart';
+                doc.body.appendChild(chart);
+
+                // The plot itself runs inside the new window once Plotly has loaded there
+                const lib = doc.createElement('script');
+                lib.src = "https://cdn.plot.ly/plotly-2.27.0.min.js";
+                lib.onload = () => {
+                    const script = doc.createElement('script');
+                    script.textContent = `
+                        const data = ${JSON.stringify(data)};
+                        const trace = {
+                            y: data,
+                            mode: 'lines',
+                            type: 'scatter',
+                            line: { width: 1, color: '#66d9ef' }
+                        };
+                        const layout = {
+                            paper_bgcolor: '#272822',
+                            plot_bgcolor: '#272822',
+                            font: { color: '#f8f8f2' },
+                            margin: { t: 50, r: 20, l: 50, b: 50 },
+                            xaxis: { gridcolor: '#49483e', zerolinecolor: '#49483e' },
+                            yaxis: { gridcolor: '#49483e', zerolinecolor: '#49483e' },
+                            title: 'Selected Data Plot'
+                        };
+                        Plotly.newPlot('chart', [trace], layout, {responsive: true});`;
+                    doc.body.appendChild(script);
+                };
+                doc.head.appendChild(lib);
+            }
             
-            document.addEventListener('mouseup', () => {{ isMouseDown = false; }});
+            document.addEventListener('mouseup', () => { isMouseDown = false; });
+
 
+            // Popouts run the same table helpers. Their source is collected on the
+            // first popout (pages that never pop out never pay for it) and shared
+            // with every later one through a Blob URL.
+            let popoutScript = null;
 
-            function popOutVariable(id) {{
-                const content = contentData[id];
-                // Use ID to reliably get the styles even if other style tags exist
-                const styles = document.getElementById('viper-styles').innerHTML;
+            function getPopoutScript() {
+                if (!popoutScript) {
+                    const src = [
+                        'let isMouseDown = false, startCell = null, activeTable = null;',
+                        ...[
+                            initTable, virtualizeTable, applyHeatmap, heatBuckets, rafThrottle, makeColResizable,
+                            makeTableSelectable, bodyRowCount, cellText, cellPos, setSelection,
+                            paintSelection, selectedValues, selectRange, updatePlotButton, plotData, copySelection
+                        ].map(f => f.toString()),
+                        "document.getElementById('popout-container').querySelectorAll('table').forEach(initTable);",
+                        "document.addEventListener('mouseup', () => { isMouseDown = false; });",
+                        "document.addEventListener('keydown', copySelection);"
+                    ].join('\\n');
+                    popoutScript = {src, url: URL.createObjectURL(new Blob([src], {type: 'application/javascript'}))};
+                }
+                return popoutScript;
+            }
+
+            function popOutVariable(id) {
+                // Open right away: popups are only allowed during the click itself
                 const win = window.open("", "_blank", "width=900,height=700");
                 if (!win) return alert("Pop-up blocked!");
-                
-                // Get function sources to inject
-                const applyHeatmapSrc = applyHeatmap.toString();
-                const makeColResizableSrc = makeColResizable.toString();
-                const makeTableSelectableSrc = makeTableSelectable.toString();
-                const selectRangeSrc = selectRange.toString();
-                const updatePlotButtonSrc = updatePlotButton.toString();
-                const plotDataSrc = plotData.toString();
-                const copySelectionSrc = copySelection.toString();
-
-                win.document.write(`
-                    <!DOCTYPE html>
-                    <html lang="en">
-                    <head>
-                        <meta charset="UTF-8">
-                        <title>${{id}} - Var Viper</title>
-                        <style>${{styles}}</style>
-                        <style>
-                            body {{ overflow: auto; padding: 0; background: var(--bg); height: 100vh; display: flex; flex-direction: column; }}
-                            .table-wrapper {{ border: none; max-height: none; flex: 1; margin: 0; }}
-                            #popout-container {{ padding: 20px; flex: 1; display: flex; flex-direction: column; }}
-                            h2 {{ margin-top: 0; color: var(--accent-pink); }}
-                        </style>
-                    </head>
-                    <body>
-                        <div id="popout-container">
-                            <h2>${{id}}</h2>
-                            ${{content}}
-                        </div>
-
-                        <!-- Plot Button -->
-                        <button id="plot-btn" onclick="plotData()">Plot Selection</button>
-
-                        <script>
-                            // Global State for Popout
-                            let isMouseDown = false;
-                            let startCell = null;
-                            let activeTable = null;
-
-                            // Inject shared helper functions
-                            ${{applyHeatmapSrc}}
-                            ${{makeColResizableSrc}}
-                            ${{makeTableSelectableSrc}}
-                            ${{selectRangeSrc}}
-                            ${{updatePlotButtonSrc}}
-                            ${{plotDataSrc}}
-                            ${{copySelectionSrc}}
-                            
-                            // Initialize interactivity in popout
-                            const bodyEl = document.getElementById('popout-container');
-                            const tables = bodyEl.querySelectorAll('table');
-                            tables.forEach(table => {{
-                                makeColResizable(table);
-                                if(table.classList.contains('heatmap-table')) applyHeatmap(table);
-                                makeTableSelectable(table);
-                            }});
-                            
-                            document.addEventListener('mouseup', () => {{ isMouseDown = false; }});
-                            document.addEventListener('keydown', copySelection);
-                        <\\/script>
-                    </body>
-                    </html>
-                `);
-                win.document.close();
-            }}
-
-            function applyHeatmap(table) {{
-                const rows = Array.from(table.querySelectorAll('tbody tr'));
-                if(rows.length === 0) return;
-                const colCount = rows[0].children.length;
-                
-                let allValues = [];
-                let allCells = [];
-
-                // Pass 1: Gather all numeric data from valid numeric columns
-                for(let c=1; c < colCount; c++) {{
-                    let colValues = [], colCells = [], isNumeric = true;
-                    for(let r=0; r < rows.length; r++) {{
-                        const cell = rows[r].children[c];
-                        const txt = cell.textContent.trim();
-                        if(txt === '' || txt === 'NaN' || txt === 'None') continue;
-                        const num = parseFloat(txt);
-                        if(isNaN(num)) {{ isNumeric = false; break; }}
-                        colValues.push(num);
-                        colCells.push({{el: cell, val: num}});
-                    }}
-                    
-                    if(isNumeric && colValues.length > 0) {{
-                        allValues = allValues.concat(colValues);
-                        allCells = allCells.concat(colCells);
-                    }}
-                }}
-
-                // Pass 2: Calculate Global Range and Apply Color
-                if(allValues.length === 0) return;
-                const min = Math.min(...allValues);
-                const max = Math.max(...allValues);
-                if(min === max) return;
-
-                allCells.forEach(item => {{
-                    const ratio = (item.val - min) / (max - min);
-                    const red = Math.round(255 * ratio);
-                    const blue = Math.round(255 * (1 - ratio));
-                    item.el.style.backgroundColor = `rgba(${{red}}, 0, ${{blue}}, 0.7)`;
-                }});
-            }}
-
-            function makeColResizable(table) {{
-                const headers = table.querySelectorAll('th');
-                headers.forEach(th => {{
-                    if(th.querySelector('.col-resizer')) return;
-                    const resizer = document.createElement('div');
-                    resizer.classList.add('col-resizer');
-                    th.appendChild(resizer);
-                    let x = 0; let w = 0;
-
-                    const md = function(e) {{
-                        x = e.clientX;
-                        w = parseInt(window.getComputedStyle(th).width, 10);
-                        document.addEventListener('mousemove', mm);
-                        document.addEventListener('mouseup', mu);
-                        resizer.classList.add('resizing');
-                        e.stopPropagation(); // Prevent sort or other events
-                    }};
-
-                    const mm = function(e) {{
-                        th.style.width = `${{w + (e.clientX - x)}}px`;
-                    }};
-
-                    const mu = function() {{
-                        document.removeEventListener('mousemove', mm);
-                        document.removeEventListener('mouseup', mu);
-                        resizer.classList.remove('resizing');
-                    }};
-
-                    resizer.addEventListener('mousedown', md);
-                    resizer.addEventListener('click', (e) => e.stopPropagation()); // Prevent click-through
-                }});
-            }}
+                withContent(id, content => fillPopout(win, id, content));
+            }
+
+            // Page styles plus the popout layout. Use ID to reliably get the
+            // styles even if other style tags exist.
+            const popoutCss = document.getElementById('viper-styles').textContent + `
+                body { overflow: auto; padding: 0; background: var(--bg); height: 100vh; display: flex; flex-direction: column; }
+                .table-wrapper { border: none; max-height: none; flex: 1; margin: 0; }
+                #popout-container { padding: 20px; flex: 1; display: flex; flex-direction: column; }
+                h2 { margin-top: 0; color: var(--accent-pink); }`;
+
+            function fillPopout(win, id, content) {
+                // Fill the blank popout directly instead of document.write()
+                const doc = win.document;
+                doc.title = `${id} - Var Viper`;
+                try {
+                    // A constructed sheet takes the CSS text as-is, with no <style>
+                    // element to parse. It has to come from the popout's own
+                    // CSSStyleSheet: browsers refuse sheets made by another document.
+                    const sheet = new win.CSSStyleSheet();
+                    sheet.replaceSync(popoutCss);
+                    doc.adoptedStyleSheets = [sheet];
+                } catch (e) {
+                    const style = doc.createElement('style');
+                    style.textContent = popoutCss;
+                    doc.head.appendChild(style);
+                }
+
+                const container = doc.createElement('div');
+                container.id = 'popout-container';
+                const title = doc.createElement('h2');
+                title.textContent = id;
+                container.appendChild(title);
+                container.insertAdjacentHTML('beforeend', content);
+
+                const plotBtn = doc.createElement('button');
+                plotBtn.id = 'plot-btn';
+                plotBtn.textContent = 'Plot Selection';
+                plotBtn.setAttribute('onclick', 'plotData()');
+
+                // The whole popout body is built detached and attached at once
+                const frag = doc.createDocumentFragment();
+                frag.append(container, plotBtn);
+                doc.body.appendChild(frag);
+
+                // Scripts set through innerHTML never run, so load the helpers as an element
+                const helpers = getPopoutScript();
+                const script = doc.createElement('script');
+                script.src = helpers.url;
+                script.onerror = () => {
+                    // Some browsers won't share blob: URLs across file:// windows
+                    const inline = doc.createElement('script');
+                    inline.textContent = helpers.src;
+                    doc.body.appendChild(inline);
+                };
+                doc.body.appendChild(script);
+            }
+
+            // --- VIRTUAL TABLES ---
+            // Large tables arrive as a header plus a JSON row payload. Only the
+            // rows in (or near) view exist in the DOM; the same <tr> elements
+            // are refilled as the table scrolls.
+            function virtualizeTable(table) {
+                const src = table.nextElementSibling;
+                if (table._vv || !src || !src.classList.contains('vv-rows')) return;
+                const overscan = 10;
+                const viewport = table.parentElement;
+                let data;
+                try { data = JSON.parse(src.textContent); }
+                catch (e) {
+                    // A bad payload would otherwise leave a silently empty table
+                    viewport.innerHTML = `<div class="error-box">Could not read table rows: ${e.message}</div>`;
+                    return;
+                }
+                const tbody = table.tBodies[0];
+                const nCols = table.tHead.rows[0].cells.length;
+                const ds = table.dataset;
+                const vv = table._vv = {
+                    data,
+                    pool: [], start: -1, end: -1, rowPx: 35, measured: false,
+                    // Heatmap buckets come precomputed from Python
+                    heatCols: ds.heatmapBuckets ? JSON.parse(ds.numericCols) : [],
+                    heat: heatBuckets(table)
+                };
+                const padTop = tbody.insertRow();
+                const padBottom = tbody.insertRow();
+                padTop.className = padBottom.className = 'vv-pad';
+                padTop.insertCell().colSpan = padBottom.insertCell().colSpan = nCols;
+
+                // Pooled rows are cloned from one prototype row
+                const proto = document.createElement('tr');
+                const protoTh = proto.appendChild(document.createElement('th'));
+                protoTh.appendChild(document.createTextNode('')); // refilled through nodeValue
+                protoTh.style.cursor = 'pointer';
+                protoTh.title = "Click to select row/column";
+                for (let c = 1; c < nCols; c++) proto.appendChild(document.createElement('td'));
+
+                const render = (initial) => {
+                    // The first render reads no layout: a fresh viewport is at the
+                    // top, and its height is at most the CSS max-height. That keeps
+                    // opening a page with many tables from forcing a layout per table.
+                    // Row height is only known once a row has been laid out
+                    // (tables inside a closed <details> have none yet)
+                    if (!initial && !vv.measured && vv.pool.length && vv.pool[0].offsetHeight) {
+                        vv.measured = true;
+                        vv.rowPx = vv.pool[0].offsetHeight;
+                        vv.start = -1;
+                    }
+                    const cols = vv.data; // column-major, index first
+                    const nRows = cols[0].length;
+                    const height = initial ? 680 : viewport.clientHeight || 680;
+                    const scrollTop = initial ? 0 : viewport.scrollTop;
+                    const start = Math.max(0, Math.floor(scrollTop / vv.rowPx) - overscan);
+                    const end = Math.min(nRows, start + Math.ceil(height / vv.rowPx) + 2 * overscan);
+                    if (start === vv.start && end === vv.end) return;
+                    vv.start = start; vv.end = end;
+
+                    // New rows are filled while detached and inserted in one go
+                    const fresh = document.createDocumentFragment();
+                    while (vv.pool.length < end - start) vv.pool.push(fresh.appendChild(proto.cloneNode(true)));
+                    for (let i = 0; i < vv.pool.length; i++) {
+                        const tr = vv.pool[i];
+                        const r = start + i;
+                        if (r >= end) { tr.style.display = 'none'; continue; }
+                        tr.style.display = '';
+                        tr.dataset.r = r;
+                        tr.cells[0].firstChild.nodeValue = cols[0][r];
+                        for (let c = 1; c < nCols; c++) tr.cells[c].textContent = cols[c][r];
+                        vv.heatCols.forEach((c, k) => {
+                            const b = vv.heat[k * nRows + r];
+                            tr.cells[c].className = b === 255 ? '' : 'hm-' + b;
+                        });
+                    }
+                    if (fresh.firstChild) tbody.insertBefore(fresh, padBottom);
+                    padTop.firstChild.style.height = `${start * vv.rowPx}px`;
+                    padBottom.firstChild.style.height = `${(nRows - end) * vv.rowPx}px`;
+                    paintSelection(table);
+                };
+
+                let ticking = false;
+                viewport.addEventListener('scroll', () => {
+                    if (ticking) return;
+                    ticking = true;
+                    requestAnimationFrame(() => { ticking = false; render(); });
+                });
+                render(true);
+                // Measure the real row height once the browser lays the page out anyway
+                requestAnimationFrame(() => render());
+            }
+
+            function applyHeatmap(table) {
+                if (table._vv) return; // coloured row by row as they render
+                // Numeric columns and each cell's bucket come precomputed from Python
+                const ds = table.dataset;
+                if (!ds.heatmapBuckets) return;
+                const cols = JSON.parse(ds.numericCols);
+                const buckets = heatBuckets(table);
+                const rows = table.tBodies[0].rows;
+                const n = buckets.length / cols.length;
+                for (let r = 0; r < rows.length && r < n; r++) {
+                    // Data cells are the <td>s; a MultiIndex puts several <th>s before them
+                    const tds = rows[r].getElementsByTagName('td');
+                    cols.forEach((c, k) => {
+                        const b = buckets[k * n + r];
+                        if (tds[c - 1] && b !== 255) tds[c - 1].className = 'hm-' + b; // 255: no colour
+                    });
+                }
+            }
+
+            function heatBuckets(table) {
+                // One byte per numeric cell, decoded once from data-heatmap-buckets
+                if (!table._heat) {
+                    const bin = atob(table.dataset.heatmapBuckets || '');
+                    const bytes = new Uint8Array(bin.length);
+                    for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+                    table._heat = bytes;
+                }
+                return table._heat;
+            }
+
+            // Runs fn at most once per animation frame, with the latest arguments.
+            // Mice can fire mousemove far faster than the screen refreshes.
+            function rafThrottle(fn) {
+                let id = 0, lastArgs;
+                return (...args) => {
+                    lastArgs = args;
+                    if (!id) id = requestAnimationFrame(() => { id = 0; fn(...lastArgs); });
+                };
+            }
+
+            function makeColResizable(table) {
+                // Resizers live on the header cells only, which size the whole column
+                if (table.dataset.resizable === '1' || !table.tHead) return;
+                table.dataset.resizable = '1';
+                // Each resizer goes into a different cell, so there is nothing to
+                // batch into a fragment; clone them from one element instead
+                const proto = document.createElement('div');
+                proto.className = 'col-resizer';
+                for (const row of table.tHead.rows) {
+                    for (const th of row.cells) th.appendChild(proto.cloneNode(false));
+                }
+
+                // One delegated listener drives every resizer in the table
+                // (clicks on a resizer are ignored by the selection handler)
+                let resizer = null, th = null, x = 0, w = 0;
+
+                const md = function(e) {
+                    resizer = e.target.closest('.col-resizer');
+                    if (!resizer) return;
+                    th = resizer.parentElement;
+                    x = e.clientX;
+                    w = th.offsetWidth; // border-box, so it matches what style.width sets
+                    document.addEventListener('mousemove', mm);
+                    document.addEventListener('mouseup', mu);
+                    resizer.classList.add('resizing');
+                    e.stopPropagation(); // Prevent sort or other events
+                };
+
+                const mm = rafThrottle(function(e) {
+                    th.style.width = `${w + (e.clientX - x)}px`;
+                });
+
+                const mu = function() {
+                    document.removeEventListener('mousemove', mm);
+                    document.removeEventListener('mouseup', mu);
+                    resizer.classList.remove('resizing');
+                };
+
+                table.addEventListener('mousedown', md);
+            }
 
             // --- SIDEBAR RESIZE LOGIC ---
-            (function() {{
+            (function() {
                 const sidebar = document.getElementById('sidebar');
                 const resizer = document.getElementById('sidebar-resizer');
                 let x = 0; let w = 0;
-                const md = function(e) {{
+                const md = function(e) {
                     x = e.clientX;
-                    w = parseInt(window.getComputedStyle(sidebar).width, 10);
+                    w = sidebar.offsetWidth;
                     document.addEventListener('mousemove', mm);
                     document.addEventListener('mouseup', mu);
                     resizer.classList.add('resizing');
-                }};
-                const mm = function(e) {{
+                };
+                const mm = rafThrottle(function(e) {
                     const newW = w + (e.clientX - x);
-                    if(newW > 100 && newW < window.innerWidth * 0.6) sidebar.style.width = `${{newW}}px`;
-                }};
-                const mu = function() {{
+                    if(newW > 100 && newW < window.innerWidth * 0.6) sidebar.style.width = `${newW}px`;
+                });
+                const mu = function() {
                     document.removeEventListener('mousemove', mm);
                     document.removeEventListener('mouseup', mu);
                     resizer.classList.remove('resizing');
-                }};
+                };
                 resizer.addEventListener('mousedown', md);
-            }})();
+            })();
         </script>
     </body>
     </html>
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html_template)
+# Blue (low) to red (high), one rule per bucket
+_TEMPLATE = _TEMPLATE.replace('__VV_HEATMAP_CSS__', '\n'.join(
+    f'            .hm-{i} {{ background-color: rgba({round(255 * i / (HEATMAP_BUCKETS - 1))}, 0, {round(255 * (1 - i / (HEATMAP_BUCKETS - 1)))}, 0.7); }}'
+    for i in range(HEATMAP_BUCKETS)))
+_TEMPLATE_HEAD, _TEMPLATE_REST = _TEMPLATE.split('__VV_VARS__')
+_TEMPLATE_MID, _TEMPLATE_TAIL = _TEMPLATE_REST.split('__VV_CONTENT__')
+
+def write_content_files(summary_list, data_store, content_dir):
+    """
+    Moves content over LAZY_CONTENT_BYTES out of the page into one script file
+    per variable, recording its URL as the summary's 'src'. Returns the
+    content that stays inline.
+    """
+    inline = {}
+    _remove_content_files(content_dir)
+    # Names are unique per run, so a tab left open from an earlier run can
+    # never load another run's file under the same name
+    version = time.time_ns()
+    for i, entry in enumerate(summary_list):
+        content = data_store[entry['id']]
+        if len(content) <= LAZY_CONTENT_BYTES:
+            inline[entry['id']] = content
+            continue
+        os.makedirs(content_dir, exist_ok=True)
+        name = f"{version}_{i}.js"
+        with open(os.path.join(content_dir, name), 'w', encoding='utf-8', buffering=1 << 20) as out:
+            out.write(f"vvContent({json_dumps(entry['id'])},")
+            out.write(json_dumps(content))
+            out.write(');')
+        entry['src'] = f"{_CONTENT_DIR}/{name}"
+    return inline
+
+def _remove_content_files(content_dir):
+    # Files from earlier runs are never loaded again; older tabs get an error box
+    try:
+        names = os.listdir(content_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.endswith('.js'):
+            try: os.remove(os.path.join(content_dir, name))
+            except OSError: pass
+
+def generate_html(summary_list, data_store):
+    filename = "var_viper_view.html"
+    filepath = os.path.join(tempfile.gettempdir(), filename)
+    inline = write_content_files(summary_list, data_store, os.path.join(tempfile.gettempdir(), _CONTENT_DIR))
+
+    # The document is streamed to disk in pieces so the full page never has to
+    # exist in memory alongside the serialized variable content.
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as out:
+        out.write(_TEMPLATE_HEAD)
+        out.write(_SCRIPT_CLOSE_RE.sub(r'<\\/', json_dumps(summary_list)))
+        out.write(_TEMPLATE_MID)
+        write_json_object(out, inline)
+        out.write(_TEMPLATE_TAIL)
     webbrowser.open('file://' + filepath)
 
 # --- 3. LAUNCHER ---